@@ -1,18 +1,25 @@
 # app.py — Tesla One-Stop (FREE) + YouTube 라이브/최신 영상
+import io
 import os
+import queue
 import time
 import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict, Optional
 from urllib.parse import urlparse, parse_qs
 
 import pandas as pd
 import requests
-import yfinance as yf
-import feedparser
-import plotly.graph_objects as go
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import streamlit as st
-from xml.etree import ElementTree as ET
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import lxml.etree as LET
+import orjson
+import diskcache
 
 st.set_page_config(page_title="Tesla One-Stop (Free)", page_icon="🚗", layout="wide")
 
@@ -23,6 +30,11 @@ TSLA = "TSLA"
 CUSIP_TSLA_PREFIX = "88160R"
 INTRADAY = {"1m","2m","5m","15m","30m","60m","90m"}
 
+# 자주 쓰는 정규식은 한 번만 컴파일
+_TAG_RE = re.compile(r"<.*?>")
+_INFOTABLE_RE = re.compile(r"<informationTable.*?</informationTable>", re.IGNORECASE | re.DOTALL)
+_INT_TRANS = str.maketrans("", "", ", \t\n\r")  # 13F 숫자 셀의 천 단위 구분자/공백 제거
+
 # 기본 기관 CIK (13F)
 DEFAULT_CIKS = {
     "BlackRock Inc.": "0001364742",
@@ -65,6 +77,9 @@ DEFAULT_YT_CHANNELS = [
 # SEC
 SEC_BASE = "https://data.sec.gov"
 SEC_UA = {"User-Agent": "TeslaDash/1.0 (your-email@example.com)"}  # 본인 이메일로 교체 권장
+SEC_RECENT_FIELDS = ("form", "accessionNumber", "reportDate", "primaryDocument")
+SEC_MAX_RPS = 8  # SEC 공정 접근 한도(10 req/s)보다 여유 있게
+SEC_ARCHIVE_TTL = 30*86400  # accession별 자료는 불변이지만 잘못 저장된 값이 영구히 남지 않도록
 
 # 안전한 시크릿 접근 (secrets.toml 없을 때도 안전)
 def get_secret(key: str, default: str = "") -> str:
@@ -77,89 +92,207 @@ X_BEARER = get_secret("X_BEARER_TOKEN", "")
 YOUTUBE_API_KEY = get_secret("YOUTUBE_API_KEY", "")
 
 # ---------------------------
-# 페이지 자동 새로고침(JS, 추가 의존성 無)
+# 페이지 자동 새로고침 (서버 측 rerun, 추가 의존성 無)
 # ---------------------------
-def auto_refresh_html(seconds: int, key: str):
-    ms = int(seconds * 1000)
-    st.components.v1.html(
-        f"""
-        <script>
-        (function(){{
-            const KEY="{key}";
-            if(!window.__autoRefreshTimers) window.__autoRefreshTimers = {{}};
-            if(!window.__autoRefreshTimers[KEY]) {{
-                window.__autoRefreshTimers[KEY] = setTimeout(function(){{
-                    const url = new URL(window.location.href);
-                    url.searchParams.set(KEY, Date.now().toString());
-                    window.location.href = url.toString();
-                }}, {ms});
-            }}
-        }})();
-        </script>
-        """, height=0
+def auto_refresh(seconds: int, key: str):
+    """
+    seconds마다 앱을 서버 측에서 다시 실행.
+    run_every 프래그먼트를 타이머로 쓰고, 마지막 전체 실행 후 seconds가 지났을 때만 st.rerun()
+    → 브라우저 새로고침 없이 세션/위젯 상태와 프런트엔드가 그대로 유지됨
+    """
+    st.session_state[key] = time.time()
+
+    @st.fragment(run_every=seconds)
+    def _tick():
+        if time.time() - st.session_state.get(key, 0) >= seconds - 0.5:
+            st.rerun()
+
+    _tick()
+
+# ---------------------------
+# HTTP 세션 (keep-alive 연결 풀 재사용)
+# ---------------------------
+def make_session(headers: Optional[Dict[str, str]] = None, pool_maxsize: int = 32) -> requests.Session:
+    s = requests.Session()
+    if headers:
+        s.headers.update(headers)
+    # raise_on_status=False: 재시도 소진 시 예외 대신 마지막 응답을 돌려줘 기존 r.ok 분기 유지
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                  raise_on_status=False)
+    s.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retry))
+    return s
+
+# 스크립트는 rerun마다 다시 실행되므로 세션/캐시 같은 공유 객체는 cache_resource로 프로세스당 1개만 생성
+@st.cache_resource
+def get_sec_session() -> requests.Session:
+    return make_session(SEC_UA)
+
+@st.cache_resource
+def get_x_session() -> requests.Session:
+    return make_session()
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """SEC/X 외 공용 세션 (Yahoo, Stooq, RSS, YouTube, 진단) — 호스트별 연결 풀은 urllib3가 분리 관리"""
+    return make_session({"User-Agent": "Mozilla/5.0"})
+
+# ---------------------------
+# 디스크 캐시 (재시작/재배포 후에도 유지되는 2차 캐시)
+# ---------------------------
+@st.cache_resource
+def get_disk_cache() -> diskcache.Cache:
+    return diskcache.Cache(os.path.join(tempfile.gettempdir(), "tesladash_cache"))
+
+@st.cache_resource
+def _refresh_state():
+    """백그라운드 갱신 중인 키 집합과 그 잠금 (rerun 간 공유)"""
+    return set(), threading.Lock()
+
+def _disk_store(key: str, ttl: int, fetch, stale_window: int):
+    value = fetch()
+    if value is not None:  # 실패(None)는 저장하지 않고 다음 호출에서 재시도
+        get_disk_cache().set(key, (value, time.time()), expire=ttl + stale_window)
+    return value
+
+def _refresh_in_background(key: str, ttl: int, fetch, stale_window: int):
+    refreshing, lock = _refresh_state()
+    with lock:
+        if key in refreshing: return
+        refreshing.add(key)
+
+    def run():
+        try:
+            _disk_store(key, ttl, fetch, stale_window)
+        except Exception:
+            pass
+        finally:
+            with lock:
+                refreshing.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+def disk_cached(key: str, ttl: int, fetch, stale_window: int = 0):
+    """
+    디스크 캐시 조회:
+    - ttl 이내: 저장된 값
+    - ttl ~ ttl+stale_window: 묵은 값을 즉시 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+    - 그 외/없음: fetch() 결과를 저장 후 반환
+    """
+    hit = get_disk_cache().get(key)
+    if hit is not None:
+        value, fetched_at = hit
+        age = time.time() - fetched_at
+        if age < ttl:
+            return value
+        if age < ttl + stale_window:
+            _refresh_in_background(key, ttl, fetch, stale_window)
+            return value
+    return _disk_store(key, ttl, fetch, stale_window)
+
+def revalidated_get(get, url: str, key: str, parse, timeout: int = 20):
+    """
+    ETag/Last-Modified 조건부 GET:
+    직전 응답의 검증값과 parse(r) 결과를 디스크에 두고 If-None-Match/If-Modified-Since로 요청,
+    304면 본문 없이 돌아오므로 저장된 결과를 그대로 반환 (get: session.get 형태의 호출자)
+    """
+    cache = get_disk_cache()
+    vkey = f"validators:{key}"
+    prev = cache.get(vkey)
+    headers = {}
+    if prev:
+        if prev.get("etag"): headers["If-None-Match"] = prev["etag"]
+        if prev.get("modified"): headers["If-Modified-Since"] = prev["modified"]
+    r = get(url, headers=headers, timeout=timeout)
+    if r.status_code == 304 and prev:
+        return prev["value"]
+    r.raise_for_status()
+    value = parse(r)
+    if r.headers.get("ETag") or r.headers.get("Last-Modified"):
+        cache.set(vkey, {"etag": r.headers.get("ETag"), "modified": r.headers.get("Last-Modified"),
+                         "value": value}, expire=7*86400)
+    return value
+
+def clear_caches():
+    """수동 새로고침: 메모리 캐시(cache_data)와 디스크 캐시(조건부 GET 검증값 포함)를 함께 비움"""
+    st.cache_data.clear()
+    get_disk_cache().clear()
+
+# ---------------------------
+# 병렬 작업용 스레드 풀
+# ---------------------------
+def thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """현재 Streamlit 실행 컨텍스트를 물려받는 스레드 풀 (캐시/스피너 경고 방지)"""
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
     )
 
 # ---------------------------
 # 가격/차트 (Yahoo + Stooq fallback)
 # ---------------------------
+@st.cache_data(ttl=300)
+def stooq_daily() -> pd.DataFrame:
+    # pandas가 URL을 직접 열면 세션/타임아웃이 적용되지 않으므로 본문만 받아서 파싱
+    r = get_http_session().get("https://stooq.com/q/d/l/?s=tsla.us&i=d", timeout=10)
+    r.raise_for_status()
+    return pd.read_csv(io.StringIO(r.text), usecols=["Date","Open","High","Low","Close","Volume"],
+                       parse_dates=["Date"], index_col="Date")
+
+def _yahoo_chart(symbol: str, period: str, interval: str) -> pd.DataFrame:
+    """Yahoo v8 chart API 한 번 호출 → OHLCV DataFrame (거래소 시간대 인덱스)"""
+    r = get_http_session().get(
+        f"https://query2.finance.yahoo.com/v8/finance/chart/{symbol}",
+        params={"range": period, "interval": interval, "includePrePost": "false"}, timeout=6,
+    )
+    if not r.ok: return pd.DataFrame()
+    res = (orjson.loads(r.content).get("chart", {}).get("result") or [None])[0]
+    if not res or not res.get("timestamp"): return pd.DataFrame()
+    q = res["indicators"]["quote"][0]
+    tz = res.get("meta", {}).get("exchangeTimezoneName") or "America/New_York"
+    idx = pd.to_datetime(res["timestamp"], unit="s", utc=True).tz_convert(tz)
+    df = pd.DataFrame({k.capitalize(): q.get(k) for k in ("open","high","low","close","volume")}, index=idx)
+    return df.dropna(subset=["Open","High","Low","Close"], how="all")
+
+# Yahoo 분봉 조회 기간 한도 (1m ≤ 7일, 2m~90m ≤ 60일, 60m ≤ 730일)
+_RANGES_1M = {"1d","5d","7d"}
+_RANGES_60D = _RANGES_1M | {"1mo","60d"}
+_RANGES_OVER_730D = {"5y","10y","max"}
+
 @st.cache_data(ttl=120)
 def safe_yf_download(symbol: str, period: str, interval: str):
     """
     강인한 가격 수집:
-    1) yfinance.Ticker().history (권장)
-    2) yfinance.download (threads=False)
-    3) interval/period 자동 보정
-    4) Stooq 일봉 최종 백업
+    1) Yahoo가 거부하는 period/interval 조합만 가능한 최대 기간으로 보정
+    2) Yahoo chart API 호출, 비면 1y/1d로 한 번 더
+    3) 그래도 실패하면 Stooq 일봉 백업
     """
-    import requests, pandas as pd, yfinance as yf
-    session = requests.Session()
-    session.headers.update({"User-Agent": "Mozilla/5.0"})
-
     # 🔧 간격 보정: 일부 환경에서 '1h' 대신 '60m'가 안정적
-    interval_fixed = {"1h": "60m"}.get(interval, interval)
-
-    # 요청 후보(우선순위)
-    combos = [(period, interval_fixed)]
-    if interval_fixed == "1m" and period not in {"1d","5d","7d"}:
-        combos.append(("5d","1m"))
-    if interval_fixed in INTRADAY and period not in {"1d","5d","7d","1mo","3mo","6mo","60d","90d"}:
-        combos.append(("1mo","5m"))
-    combos.append(("1y","1d"))  # 최후의 야후 데일리
+    p, i = period, {"1h": "60m"}.get(interval, interval)
+    # 한도를 넘는 조합은 실패가 확실하므로 재시도 대신 처음부터 봉 간격은 유지하고 기간만 줄임
+    if i == "1m" and p not in _RANGES_1M:
+        p = "5d"
+    elif i in INTRADAY - {"1m","60m"} and p not in _RANGES_60D:
+        p = "1mo"
+    elif i == "60m" and p in _RANGES_OVER_730D:
+        p = "2y"
 
     last_err = None
-
-    # 1) Ticker().history (가장 안정)
-    try:
-        tkr = yf.Ticker(symbol, session=session)
-        df = tkr.history(period=period, interval=interval_fixed, prepost=False, auto_adjust=False)
-        if not df.empty:
-            return df, (period, interval_fixed), "yfinance.history"
-    except Exception as e:
-        last_err = f"history: {e}"
-
-    # 2) download 재시도 (threads=False가 오류 줄임)
-    for p, i in combos:
+    combos = [(p, i)]
+    if (p, i) != ("1y", "1d"):
+        combos.append(("1y", "1d"))  # 최후의 야후 데일리
+    for cp, ci in combos:
         try:
-            df = yf.download(
-                symbol, period=p, interval=i,
-                auto_adjust=False, prepost=False,
-                progress=False, threads=False, session=session
-            )
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = [c[0] for c in df.columns]
+            df = _yahoo_chart(symbol, cp, ci)
             if not df.empty:
-                return df, (p, i), "yfinance.download"
+                return df, (cp, ci), "Yahoo chart API"
+            last_err = f"Yahoo chart {cp}/{ci}: empty"
         except Exception as e:
-            last_err = f"download {p}/{i}: {e}"
+            last_err = f"Yahoo chart {cp}/{ci}: {e}"
 
-    # 3) Stooq 일봉 백업
+    # Stooq 일봉 백업
     try:
-        import pandas as pd
-        stooq = pd.read_csv("https://stooq.com/q/d/l/?s=tsla.us&i=d")
-        stooq.rename(columns={"Date":"Datetime"}, inplace=True)
-        stooq["Datetime"] = pd.to_datetime(stooq["Datetime"])
-        stooq.set_index("Datetime", inplace=True)
-        stooq = stooq.dropna()
+        stooq = stooq_daily()
         if not stooq.empty:
             return stooq, ("stooq-daily","1d"), "Yahoo empty → Stooq daily fallback"
     except Exception as e:
@@ -168,10 +301,34 @@ def safe_yf_download(symbol: str, period: str, interval: str):
     # 모두 실패
     return pd.DataFrame(), None, last_err
 
-def plot_candles(df: pd.DataFrame, title: str):
+# 다운샘플 시 고를 '보기 좋은' 봉 간격 (1m → 2m → 5m → 15m …)
+_BAR_STEPS = tuple(pd.Timedelta(x) for x in ("2min", "5min", "15min", "30min", "1h", "1D", "7D"))
+
+def downsample_ohlc(df: pd.DataFrame, max_bars: int = 2000, target_bars: int = 1500) -> pd.DataFrame:
+    """봉이 max_bars보다 많으면 약 target_bars개가 되도록 더 긴 간격의 OHLCV 봉으로 묶음"""
+    if len(df) <= max_bars or not isinstance(df.index, pd.DatetimeIndex):
+        return df
+    step = df.index.to_series().diff().median()
+    # 묶은 뒤 예상 봉 수가 max_bars 이하인 간격 중 target_bars에 가장 가까운 것
+    est = lambda b: len(df) * (step / b)
+    fits = [b for b in _BAR_STEPS if b > step and est(b) <= max_bars]
+    rule = min(fits, key=lambda b: abs(est(b) - target_bars)) if fits else step * -(-len(df) // target_bars)
+    agg = {"Open":"first", "High":"max", "Low":"min", "Close":"last"}
+    if "Volume" in df.columns:
+        agg["Volume"] = "sum"
+    # origin="start": 첫 봉 시각(예: 09:30) 기준으로 구간을 나눠 장 시작과 맞춤
+    return df.resample(rule, origin="start").agg(agg).dropna(subset=["Open"])
+
+def plot_candles(df: pd.DataFrame, title: str, high_res: bool = False):
     if df.empty:
         st.error("차트 데이터가 비어 있습니다.")
         return
+    if not high_res:
+        n = len(df)
+        df = downsample_ohlc(df)
+        if len(df) < n:
+            st.caption(f"봉 {n:,}개 → {len(df):,}개로 묶어 표시 (사이드바에서 고해상도 선택 가능)")
+    import plotly.graph_objects as go
     fig = go.Figure([go.Candlestick(
         x=df.index, open=df["Open"], high=df["High"], low=df["Low"], close=df["Close"], name="Price"
     )])
@@ -192,140 +349,216 @@ def plot_candles(df: pd.DataFrame, title: str):
 # ---------------------------
 @st.cache_data(ttl=300)
 def fetch_rss(feed_url: str, limit: int = 12) -> List[Dict]:
-    parsed = feedparser.parse(feed_url)
-    items = []
-    for e in parsed.entries[:limit]:
-        items.append({
-            "title": e.get("title"),
-            "link": e.get("link"),
-            "published": e.get("published", ""),
-            "summary": re.sub("<.*?>","", e.get("summary","")) if e.get("summary") else "",
-        })
-    return items
+    def parse(r):
+        import feedparser
+        parsed = feedparser.parse(r.content)
+        items = []
+        for e in parsed.entries[:limit]:
+            items.append({
+                "title": e.get("title"),
+                "link": e.get("link"),
+                "published": e.get("published", ""),
+                "summary": _TAG_RE.sub("", e.get("summary","")) if e.get("summary") else "",
+            })
+        return items
+
+    def fetch():
+        return revalidated_get(get_http_session().get, feed_url, f"rss:{feed_url}:{limit}", parse, timeout=8)
+    return disk_cached(f"rss:{feed_url}:{limit}", 300, fetch, stale_window=3600)
+
+@st.cache_data(ttl=300)
+def fetch_all_rss(feed_urls: tuple, limit: int = 12) -> Dict[str, List[Dict]]:
+    """여러 피드를 동시에 수집 → 총 대기 시간이 피드 합이 아니라 가장 느린 피드 하나 수준"""
+    out = {}
+    with thread_pool(max_workers=max(1, len(feed_urls))) as ex:
+        futures = {ex.submit(fetch_rss, u, limit): u for u in feed_urls}
+        for fut in as_completed(futures):
+            try:
+                out[futures[fut]] = fut.result()
+            except Exception:
+                out[futures[fut]] = []
+    return out
 
 # ---------------------------
 # SEC 13F (무료)
 # ---------------------------
-def _strip_xml_ns(xml_text: str) -> str:
-    return re.sub(r'\sxmlns(:\w+)?="[^"]+"','', xml_text)
-
-def _to_int(x):
-    try:
-        return int(str(x).replace(",","").strip())
-    except Exception:
-        return None
+class RateLimiter:
+    """스레드 공용 요청 속도 제한: 호출 간격을 1/rps 이상으로 벌려 전체 초당 요청 수를 제한"""
+    def __init__(self, rps: float):
+        self.rps = rps
+        self.lock = threading.Lock()
+        self.next_t = 0.0
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            wait = max(0.0, self.next_t - now)
+            self.next_t = max(now, self.next_t) + 1.0 / self.rps
+        if wait:
+            time.sleep(wait)
+
+@st.cache_resource
+def get_sec_limiter() -> RateLimiter:
+    return RateLimiter(SEC_MAX_RPS)
+
+def _sec_get(url: str, timeout: int = 20, stream: bool = False,
+             headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    get_sec_limiter().acquire()
+    return get_sec_session().get(url, timeout=timeout, stream=stream, headers=headers)
 
 @st.cache_data(ttl=3600)
-def sec_recent_filings(cik: str) -> pd.DataFrame:
+def sec_recent_filings(cik: str) -> Dict[str, list]:
+    """submissions JSON의 filings.recent에서 쓰는 필드만 (필드명 → 병렬 리스트)"""
     cik10 = str(cik).zfill(10)
     url = f"{SEC_BASE}/submissions/CIK{cik10}.json"
-    r = requests.get(url, headers=SEC_UA, timeout=20)
-    r.raise_for_status()
-    js = r.json()
-    rec = js.get("filings", {}).get("recent", {})
-    return pd.DataFrame(rec)
+
+    def parse(r):
+        rec = orjson.loads(r.content).get("filings", {}).get("recent", {})
+        # cache_data는 적중할 때마다 반환값을 unpickle해 복사본을 주므로 필요한 열만 남겨 크기를 줄임
+        return {k: rec.get(k, []) for k in SEC_RECENT_FIELDS}
+
+    def fetch():
+        return revalidated_get(_sec_get, url, f"sec:recent:{cik10}", parse, timeout=20)
+    return disk_cached(f"sec:recent:{cik10}", 3600, fetch, stale_window=24*3600)
 
 def _acc_nodash(acc: str) -> str:
     return acc.replace("-","")
 
 @st.cache_data(ttl=3600)
 def sec_list_13f_accessions(cik: str, limit=3) -> List[Dict]:
-    df = sec_recent_filings(cik)
-    if df.empty: return []
-    mask = df["form"].isin(["13F-HR","13F-HR/A"])
-    sdf = df[mask].head(limit)
+    rec = sec_recent_filings(cik)
+    forms = rec.get("form", [])
+    accs = rec.get("accessionNumber", [])
+    dates = rec.get("reportDate", [])
+    docs = rec.get("primaryDocument", [])
     rows = []
-    for _, r in sdf.iterrows():
+    # 최신순 리스트라 필요한 개수만 찾으면 바로 종료
+    for i, f in enumerate(forms):
+        if f not in ("13F-HR","13F-HR/A"): continue
         rows.append({
             "cik": cik,
-            "accession": r["accessionNumber"],
-            "reportDate": r.get("reportDate",""),
-            "primaryDocument": r.get("primaryDocument",""),
+            "accession": accs[i],
+            "reportDate": dates[i] if i < len(dates) else "",
+            "primaryDocument": docs[i] if i < len(docs) else "",
+            "form": f,
         })
+        if len(rows) >= limit: break
     return rows
 
+def _sec_archive_url(cik: str, accession: str, name: str) -> str:
+    return f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{_acc_nodash(accession)}/{name}"
+
 @st.cache_data(ttl=3600)
 def sec_find_infotable_url(cik: str, accession: str) -> Optional[str]:
-    cik_nozero = str(int(cik)); acc = _acc_nodash(accession)
-    idx = f"https://www.sec.gov/Archives/edgar/data/{cik_nozero}/{acc}/index.json"
-    r = requests.get(idx, headers=SEC_UA, timeout=20)
+    # Archives 아래 자료는 accession별로 고정 → 디스크에 오래(30일) 보관
+    return disk_cached(f"sec:infotable-url:{cik}:{accession}", SEC_ARCHIVE_TTL,
+                       lambda: _find_infotable_url(cik, accession))
+
+def _find_infotable_url(cik: str, accession: str) -> Optional[str]:
+    idx = _sec_archive_url(cik, accession, "index.json")
+    r = _sec_get(idx, timeout=20)
     if not r.ok: return None
-    files = r.json().get("directory",{}).get("item",[])
+    files = orjson.loads(r.content).get("directory",{}).get("item",[])
     for f in files:
         name = f.get("name","").lower()
         if name.endswith(".xml") and ("infotable" in name or "informationtable" in name or "form13f" in name):
-            return f"https://www.sec.gov/Archives/edgar/data/{cik_nozero}/{acc}/{f['name']}"
+            return _sec_archive_url(cik, accession, f["name"])
     for f in files:
         name = f.get("name","").lower()
         if name.endswith(".txt"):
-            return f"https://www.sec.gov/Archives/edgar/data/{cik_nozero}/{acc}/{f['name']}"
+            return _sec_archive_url(cik, accession, f["name"])
     return None
 
-def _parse_infotable_xml(xml_text: str) -> pd.DataFrame:
-    m = re.search(r"<informationTable[\s\S]*</informationTable>", xml_text, re.IGNORECASE)
-    if m: xml_text = m.group(0)
-    xml_text = _strip_xml_ns(xml_text)
-    root = ET.fromstring(xml_text.encode("utf-8"))
-    rows = []
-    for it in root.iterfind(".//infoTable"):
-        issuer = (it.findtext("nameOfIssuer","") or "").strip()
-        cusip = (it.findtext("cusip","") or "").strip()
-        amt = it.find(".//shrsOrPrnAmt/sshPrnamt")
-        shares = _to_int(amt.text) if (amt is not None and amt.text) else None
-        val = _to_int(it.findtext("value"))
-        value_usd = val*1000 if val is not None else None
-        rows.append({"issuer":issuer,"cusip":cusip,"shares":shares,"value_usd":value_usd})
-    return pd.DataFrame(rows)
+def _sec_get_infotable(cik: str, accession: str) -> Optional[requests.Response]:
+    """흔한 파일명(infotable.xml)을 먼저 직접 요청, 404일 때만 index.json으로 파일명 조회"""
+    guess = _sec_archive_url(cik, accession, "infotable.xml")
+    miss_key = f"404:{guess}"
+    cache = get_disk_cache()
+    if miss_key not in cache:
+        r = _sec_get(guess, timeout=30, stream=True)
+        if r.ok: return r
+        r.close()
+        if r.status_code == 404:
+            cache.set(miss_key, True, expire=SEC_ARCHIVE_TTL)  # 같은 추측을 반복하지 않음 (accession 내용은 불변)
+    url = sec_find_infotable_url(cik, accession)
+    if not url: return None
+    return _sec_get(url, timeout=30, stream=True)
 
 @st.cache_data(ttl=3600)
 def sec_tsla_position_from_13f(cik: str, accession: str) -> Optional[Dict]:
-    url = sec_find_infotable_url(cik, accession)
-    if not url: return None
-    r = requests.get(url, headers=SEC_UA, timeout=30)
-    if not r.ok or not r.text: return None
-    try:
-        df = _parse_infotable_xml(r.text)
-    except Exception:
-        return None
-    if df.empty:
-        return {"shares":0, "value_usd":0}
-    m = df[(df["cusip"].str.startswith(CUSIP_TSLA_PREFIX, na=False)) |
-           (df["issuer"].str.contains("TESLA", case=False, na=False))]
-    if m.empty:
-        return {"shares":0, "value_usd":0}
+    # 제출된 13F(accession)는 바뀌지 않으므로 디스크에 오래(30일) 보관
+    return disk_cached(f"13f:{cik}:{accession}", SEC_ARCHIVE_TTL,
+                       lambda: _tsla_position_from_13f(cik, accession))
+
+def _sum_tsla_holdings(source) -> Dict:
+    """infoTable XML 스트림을 읽으며 TSLA 행만 합산 (DataFrame 없이, 처리한 요소는 즉시 해제)"""
+    shares = value = 0
+    for _, it in LET.iterparse(source, tag="{*}infoTable", huge_tree=True, recover=True):
+        cusip = (it.findtext("{*}cusip") or "").strip()
+        if cusip.startswith(CUSIP_TSLA_PREFIX) or "TESLA" in (it.findtext("{*}nameOfIssuer") or "").upper():
+            s = it.findtext("{*}shrsOrPrnAmt/{*}sshPrnamt")
+            v = it.findtext("{*}value")
+            shares += int(s.translate(_INT_TRANS)) if s else 0
+            value += int(v.translate(_INT_TRANS)) * 1000 if v else 0
+        it.clear()
+        while it.getprevious() is not None:
+            del it.getparent()[0]
+    return {"shares": shares, "value_usd": value}
+
+def _tsla_position_from_13f(cik: str, accession: str) -> Optional[Dict]:
+    r = _sec_get_infotable(cik, accession)
+    if r is None: return None
+    with r:
+        if not r.ok: return None
+        if r.url.lower().endswith(".xml"):
+            # XML 원본은 응답 본문을 그대로 스트리밍 파싱
+            r.raw.decode_content = True
+            source = r.raw
+        else:
+            # .txt(SGML 묶음)는 informationTable 구간만 잘라 같은 경로로
+            m = _INFOTABLE_RE.search(r.text or "")
+            if not m: return None
+            source = io.BytesIO(m.group(0).encode("utf-8"))
+        try:
+            return _sum_tsla_holdings(source)
+        except Exception:
+            return None
+
+def _fetch_manager(name: str, cik: str) -> Optional[Dict]:
+    accs = sec_list_13f_accessions(cik, limit=2)
+    if not accs: return None
+    latest = accs[0]; prev = accs[1] if len(accs)>1 else None
+    latest_pos = sec_tsla_position_from_13f(cik, latest["accession"])
+    prev_pos = sec_tsla_position_from_13f(cik, prev["accession"]) if prev else None
+    shares = latest_pos["shares"] if latest_pos else None
+    value_usd = latest_pos["value_usd"] if latest_pos else None
+    delta = None
+    if latest_pos and prev_pos:
+        delta = (latest_pos["shares"] or 0) - (prev_pos["shares"] or 0)
     return {
-        "shares": int(m["shares"].fillna(0).sum()),
-        "value_usd": int(m["value_usd"].fillna(0).sum())
+        "기관/펀드": name,
+        "CIK": cik,
+        "보고일(최근)": latest.get("reportDate",""),
+        "보유주수(최근)": shares,
+        "평가액(USD, 최근)": value_usd,
+        "보유주수 증감(qoq)": delta
     }
 
 def build_13f_table(managers: Dict[str, str]) -> pd.DataFrame:
-    out = []
-    for name, cik in managers.items():
-        try:
-            accs = sec_list_13f_accessions(cik, limit=2)
-            if not accs: continue
-            latest = accs[0]; prev = accs[1] if len(accs)>1 else None
-            latest_pos = sec_tsla_position_from_13f(cik, latest["accession"])
-            time.sleep(0.4)
-            prev_pos = sec_tsla_position_from_13f(cik, prev["accession"]) if prev else None
-            shares = latest_pos["shares"] if latest_pos else None
-            value_usd = latest_pos["value_usd"] if latest_pos else None
-            delta = None
-            if latest_pos and prev_pos:
-                delta = (latest_pos["shares"] or 0) - (prev_pos["shares"] or 0)
-            out.append({
-                "기관/펀드": name,
-                "CIK": cik,
-                "보고일(최근)": latest.get("reportDate",""),
-                "보유주수(최근)": shares,
-                "평가액(USD, 최근)": value_usd,
-                "보유주수 증감(qoq)": delta
-            })
-        except Exception:
-            continue
-    df = pd.DataFrame(out)
+    done = {}
+    # 기관별 조회는 네트워크 대기 위주 → 스레드 병렬, 요청 속도는 _sec_get이 전역 제한
+    with thread_pool(max_workers=max(1, min(5, len(managers)))) as ex:
+        futures = {ex.submit(_fetch_manager, name, cik): i for i, (name, cik) in enumerate(managers.items())}
+        for fut in as_completed(futures):
+            try:
+                row = fut.result()
+            except Exception:
+                continue
+            if row: done[futures[fut]] = row
+    # 완료 순서와 무관하게 입력 순서로 모은 뒤 안정 정렬 → 동률일 때도 표 순서가 매번 같음
+    df = pd.DataFrame([done[i] for i in sorted(done)])
     if not df.empty:
-        df = df.sort_values(by=["보유주수(최근)"], ascending=False)
+        df = df.sort_values(by=["보유주수(최근)"], ascending=False, kind="stable")
     return df
 
 # ---------------------------
@@ -335,13 +568,26 @@ def _x_headers():
     if not X_BEARER: return None
     return {"Authorization": f"Bearer {X_BEARER}"}
 
-def _x_api_get(url, params=None, timeout=15):
+X_API_BASES = ("https://api.x.com", "https://api.twitter.com")
+
+@st.cache_resource
+def _x_base_pref() -> Dict[str, Optional[str]]:
+    """마지막으로 응답에 성공한 X API 호스트 (프로세스 공용, rerun 간 유지)"""
+    return {"base": None}
+
+def _x_api_get(url, params=None, timeout=15, session=None, pref=None):
+    """session/pref를 넘기면 cache_resource 조회 없이 사용 (스크립트 컨텍스트 없는 스레드용)"""
     h = _x_headers()
     if not h: return None
-    for base in ("https://api.x.com", "https://api.twitter.com"):
+    session = session or get_x_session()
+    pref = pref or _x_base_pref()
+    # 성공했던 호스트를 먼저 시도, 실패할 때만 나머지로
+    for base in sorted(X_API_BASES, key=lambda b: b != pref["base"]):
         try:
-            r = requests.get(base+url, headers=h, params=params, timeout=timeout)
-            if r.ok: return r.json()
+            r = session.get(base+url, headers=h, params=params, timeout=timeout)
+            if r.ok:
+                pref["base"] = base
+                return orjson.loads(r.content)
         except Exception:
             pass
     return None
@@ -353,113 +599,212 @@ def x_get_user_id(username: str) -> Optional[str]:
     if not js: return None
     return js.get("data",{}).get("id")
 
-@st.cache_data(ttl=0)
+@st.cache_data(ttl=15)
 def x_fetch_latest_tweets(user_id: str, since_id: Optional[str]=None, max_results: int=5):
+    return _x_fetch_tweets(user_id, since_id, max_results)
+
+def _x_fetch_tweets(user_id: str, since_id: Optional[str]=None, max_results: int=5, session=None, pref=None):
     params = {"max_results":str(max_results), "exclude":"retweets,replies",
               "tweet.fields":"created_at,public_metrics,entities"}
     if since_id: params["since_id"] = since_id
-    js = _x_api_get(f"/2/users/{user_id}/tweets", params=params)
+    js = _x_api_get(f"/2/users/{user_id}/tweets", params=params, session=session, pref=pref)
     if not js: return [], since_id
     data = js.get("data", [])
-    data.sort(key=lambda t: t.get("id"), reverse=False)
+    data.reverse()  # API는 최신순으로 반환 → 뒤집기만 하면 오래된 순
     new_since = data[-1]["id"] if data else since_id
     return data, new_since
 
 def _format_tweet_text(t):
     txt = t.get("text","")
     ents = (t.get("entities") or {}).get("urls", []) or []
-    for url in ents:
-        u = url.get("url"); ex = url.get("expanded_url") or u
-        if u: txt = txt.replace(u, ex)
-    return txt
+    mapping = {u["url"]: (u.get("expanded_url") or u["url"]) for u in ents if u.get("url")}
+    if not mapping: return txt
+    # 단축 URL들을 한 번의 스캔으로 치환 (긴 것부터 매칭해 접두어가 겹쳐도 안전)
+    pattern = re.compile("|".join(map(re.escape, sorted(mapping, key=len, reverse=True))))
+    return pattern.sub(lambda m: mapping[m.group(0)], txt)
+
+def x_poll_tweets(user_id: str, refresh_sec: int, keep: int = 20) -> List[Dict]:
+    """
+    세션 단위 stale-while-revalidate 폴링:
+    - 마지막 조회가 (refresh_sec-5)초 이내면 저장된 트윗을 그대로 반환
+    - 그보다 오래됐으면 저장된 트윗을 먼저 반환하고 백그라운드 스레드에서 새 트윗 조회
+    스레드는 session_state를 직접 건드리지 않고 큐로 결과만 넘기며, 다음 rerun에서 반영한다.
+    스레드는 스크립트 실행보다 오래 살 수 있으므로 컨텍스트를 붙이지 않고 캐시 없는 조회만 한다
+    (캐시 함수의 스피너가 이미 끝난 실행에 요소를 남기지 않도록).
+    """
+    state = st.session_state.setdefault(f"tw_{user_id}", {
+        "tweets": [], "since_id": None, "fetched_at": 0.0, "queue": queue.Queue(), "inflight": False,
+    })
+
+    def merge(new, since_id):
+        state["tweets"] = (state["tweets"] + new)[-keep:]
+        state["since_id"] = since_id
+        state["fetched_at"] = time.time()
+
+    while True:
+        try:
+            merge(*state["queue"].get_nowait())
+        except queue.Empty:
+            break
+        state["inflight"] = False
+
+    if not state["fetched_at"]:  # 첫 조회는 보여줄 것이 없으니 동기로
+        merge(*x_fetch_latest_tweets(user_id))
+    elif not state["inflight"] and time.time() - state["fetched_at"] >= max(0, refresh_sec - 5):
+        state["inflight"] = True
+        q, since = state["queue"], state["since_id"]
+        session, pref = get_x_session(), _x_base_pref()
+
+        def run():
+            try:
+                q.put(_x_fetch_tweets(user_id, since_id=since, session=session, pref=pref))
+            except Exception:
+                q.put(([], since))
+
+        threading.Thread(target=run, daemon=True).start()
+    return state["tweets"]
 
 # ---------------------------
 # YouTube (RSS + Data API v3)
 # ---------------------------
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_YT = "{http://www.youtube.com/xml/schemas/2015}"
+
 @st.cache_data(ttl=300)
 def yt_rss_latest(channel_id: str, limit: int = 6):
-    """API 키 없이 최신 영상 리스트"""
+    """API 키 없이 최신 영상 리스트 (고정된 Atom 스키마라 feedparser 대신 lxml로 직접 파싱)"""
     feed = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-    parsed = feedparser.parse(feed)
-    items = []
-    for e in parsed.entries[:limit]:
-        vid = e.get("yt_videoid")
-        if not vid:
-            # 링크에서 v 파라미터 추출
-            try:
-                q = parse_qs(urlparse(e.get("link","")).query)
-                vid = q.get("v",[None])[0]
-            except Exception:
-                vid = None
-        items.append({
-            "video_id": vid,
-            "title": e.get("title",""),
-            "link": e.get("link",""),
-            "published": e.get("published",""),
-        })
-    return items
 
-@st.cache_data(ttl=60)
-def yt_api_live_videos(channel_id: str, max_results: int = 3):
-    """API 키가 있을 때 해당 채널의 라이브 중인 영상 검색"""
-    if not YOUTUBE_API_KEY:
+    def parse(r):
+        root = LET.fromstring(r.content)
+        items = []
+        for e in root.iterfind(f"{_ATOM}entry"):
+            if len(items) >= limit: break
+            link_el = e.find(f"{_ATOM}link[@rel='alternate']")
+            if link_el is None: link_el = e.find(f"{_ATOM}link")
+            link = link_el.get("href", "") if link_el is not None else ""
+            vid = e.findtext(f"{_YT}videoId")
+            if not vid:
+                # 링크에서 v 파라미터 추출
+                vid = parse_qs(urlparse(link).query).get("v",[None])[0]
+            items.append({
+                "video_id": vid,
+                "title": e.findtext(f"{_ATOM}title", default=""),
+                "link": link,
+                "published": e.findtext(f"{_ATOM}published", default=""),
+            })
+        return items
+
+    try:
+        return revalidated_get(get_http_session().get, feed, f"yt-feed:{channel_id}:{limit}", parse, timeout=8)
+    except Exception:
         return []
-    url = "https://www.googleapis.com/youtube/v3/search"
-    params = {
-        "part": "snippet",
-        "channelId": channel_id,
-        "eventType": "live",
-        "type": "video",
-        "order": "date",
-        "maxResults": str(max_results),
-        "key": YOUTUBE_API_KEY,
-    }
-    r = requests.get(url, params=params, timeout=15)
+
+YT_API = "https://www.googleapis.com/youtube/v3"
+
+def _yt_api(endpoint: str, params: Dict) -> Optional[Dict]:
+    """YouTube Data API 호출 (키 자동 첨부), 키가 없거나 실패하면 None"""
+    if not YOUTUBE_API_KEY:
+        return None
+    try:
+        r = get_http_session().get(f"{YT_API}/{endpoint}", params={**params, "key": YOUTUBE_API_KEY}, timeout=15)
+    except requests.RequestException:
+        return None
     if not r.ok:
+        return None
+    return orjson.loads(r.content)
+
+@st.cache_data(ttl=30*86400)
+def yt_uploads_playlist(channel_id: str) -> str:
+    """채널 업로드 재생목록 ID (사실상 불변이라 길게 캐시). API 실패 시 UC… → UU… 규칙으로 추정"""
+    js = _yt_api("channels", {"part": "contentDetails", "id": channel_id}) or {}
+    for it in js.get("items", []):
+        pid = it.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+        if pid: return pid
+    return "UU" + channel_id[2:] if channel_id.startswith("UC") else ""
+
+@st.cache_data(ttl=60)
+def yt_playlist_video_ids(playlist_id: str, max_results: int = 5) -> List[str]:
+    """재생목록의 최근 영상 ID (playlistItems.list, 1 unit)"""
+    if not playlist_id:
         return []
-    data = r.json().get("items", [])
-    out = []
-    for it in data:
-        vid = it.get("id",{}).get("videoId")
-        sn = it.get("snippet",{})
-        out.append({
-            "video_id": vid,
-            "title": sn.get("title","(live)"),
-            "published": sn.get("publishedAt",""),
-            "link": f"https://www.youtube.com/watch?v={vid}" if vid else "",
-        })
+    js = _yt_api("playlistItems", {"part": "contentDetails", "playlistId": playlist_id,
+                                   "maxResults": str(max_results)}) or {}
+    return [it["contentDetails"]["videoId"] for it in js.get("items", [])
+            if it.get("contentDetails", {}).get("videoId")]
+
+@st.cache_data(ttl=60)
+def yt_api_live_for_channels(channel_ids: tuple, recent: int = 5) -> Dict[str, List[Dict]]:
+    """
+    여러 채널의 라이브 영상을 한 번에 확인 (채널마다 search.list 100 units 대신):
+    채널별 업로드 재생목록의 최근 영상 ID를 모아 videos.list(최대 50개씩, 1 unit)로 조회하고,
+    actualStartTime은 있고 actualEndTime은 없는 영상을 라이브 중으로 판정
+    """
+    if not YOUTUBE_API_KEY or not channel_ids:
+        return {}
+
+    def recent_ids(cid):
+        try:
+            return yt_playlist_video_ids(yt_uploads_playlist(cid), recent)
+        except Exception:
+            return []
+
+    with thread_pool(max_workers=min(8, len(channel_ids))) as ex:
+        ids = [v for vids in ex.map(recent_ids, channel_ids) for v in vids]
+    out: Dict[str, List[Dict]] = {}
+    for i in range(0, len(ids), 50):
+        js = _yt_api("videos", {"part": "snippet,liveStreamingDetails", "id": ",".join(ids[i:i+50])}) or {}
+        for it in js.get("items", []):
+            live = it.get("liveStreamingDetails") or {}
+            if not live.get("actualStartTime") or live.get("actualEndTime"):
+                continue
+            vid = it.get("id")
+            sn = it.get("snippet", {})
+            out.setdefault(sn.get("channelId", ""), []).append({
+                "video_id": vid,
+                "title": sn.get("title","(live)"),
+                "published": live.get("actualStartTime",""),
+                "link": f"https://www.youtube.com/watch?v={vid}" if vid else "",
+            })
     return out
 
 @st.cache_data(ttl=300)
 def yt_api_latest_videos(channel_id: str, max_results: int = 6):
-    """API 키가 있으면 검색 API로 최신 영상(업로드) 조회; 없으면 RSS를 쓰는 게 낫다."""
+    """API 키가 있으면 업로드 재생목록(playlistItems.list, 1 unit)으로 최신 영상 조회; 없거나 실패하면 RSS"""
     if not YOUTUBE_API_KEY:
         return yt_rss_latest(channel_id, max_results)
-    url = "https://www.googleapis.com/youtube/v3/search"
-    params = {
-        "part": "snippet",
-        "channelId": channel_id,
-        "type": "video",
-        "order": "date",
+    js = _yt_api("playlistItems", {
+        "part": "snippet,contentDetails",
+        "playlistId": yt_uploads_playlist(channel_id),
         "maxResults": str(max_results),
-        "key": YOUTUBE_API_KEY,
-    }
-    r = requests.get(url, params=params, timeout=15)
-    if not r.ok:
+    })
+    if js is None:
         return yt_rss_latest(channel_id, max_results)
-    data = r.json().get("items", [])
     out = []
-    for it in data:
-        vid = it.get("id",{}).get("videoId")
+    for it in js.get("items", []):
         sn = it.get("snippet",{})
+        vid = sn.get("resourceId",{}).get("videoId")
         out.append({
             "video_id": vid,
             "title": sn.get("title",""),
-            "published": sn.get("publishedAt",""),
+            "published": it.get("contentDetails",{}).get("videoPublishedAt") or sn.get("publishedAt",""),
             "link": f"https://www.youtube.com/watch?v={vid}" if vid else "",
         })
     return out
 
+def yt_fetch_for_channels(fetch, channel_ids: List[str], **kwargs) -> List[List[Dict]]:
+    """채널별 조회를 병렬 실행 (총 대기 = 가장 느린 채널), 결과는 channel_ids 순서 그대로"""
+    if not channel_ids: return []
+
+    def one(cid):
+        try:
+            return fetch(cid, **kwargs)
+        except Exception:
+            return []
+
+    with thread_pool(max_workers=min(8, len(channel_ids))) as ex:
+        return list(ex.map(one, channel_ids))
+
 def yt_embed(video_id: str, height: int = 315):
     if not video_id:
         return
@@ -486,6 +831,7 @@ page = st.sidebar.radio(
 # ---- 차트 ----
 if page == "📈 차트":
     st.title("📈 TSLA 차트 (안정화 버전)")
+    high_res = st.sidebar.toggle("고해상도 차트 (모든 봉 표시)", value=False)
     c1,c2,c3 = st.columns(3)
     with c1:
         period = st.selectbox("기간", ["1d","5d","7d","1mo","3mo","6mo","1y"], index=0)
@@ -493,14 +839,13 @@ if page == "📈 차트":
         interval = st.selectbox("봉 간격", ["1m","5m","15m","1h","1d"], index=0)
     with c3:
         if st.button("캐시 초기화"):
-            st.cache_data.clear()
+            clear_caches()
             st.success("캐시 삭제 완료. 다시 불러오는 중…")
     df, used, note = safe_yf_download("TSLA", period, interval)
     if note: st.caption(f"소스: {note}")
     if df.empty:
         st.error("시세를 가져오지 못했어요.")
         with st.expander("네트워크 진단"):
-            import requests
             tests = [
                 "https://query2.finance.yahoo.com/v1/finance/trending/US?count=1",
                 "https://query2.finance.yahoo.com/v8/finance/chart/TSLA?range=1d&interval=1m",
@@ -508,12 +853,12 @@ if page == "📈 차트":
             ]
             for u in tests:
                 try:
-                    r = requests.get(u, headers={"User-Agent":"Mozilla/5.0"}, timeout=6)
+                    r = get_http_session().get(u, timeout=6)
                     st.write(u, "→", r.status_code, f"{len(r.content)} bytes")
                 except Exception as e:
                     st.write(u, "→", str(e))
     else:
-        plot_candles(df, f"TSLA {used[0]}/{used[1]}")
+        plot_candles(df, f"TSLA {used[0]}/{used[1]}", high_res=high_res)
 # ---- 뉴스/X ----
 elif page == "📰 뉴스/코멘트":
     st.title("📰 뉴스 & 코멘트")
@@ -522,11 +867,12 @@ elif page == "📰 뉴스/코멘트":
         cols = st.columns(2)
         keys = list(RSS_SOURCES.keys())
         left, right = keys[:(len(keys)+1)//2], keys[(len(keys)+1)//2:]
+        feeds = fetch_all_rss(tuple(RSS_SOURCES.values()), limit=7)
         for col, group in zip(cols, [left, right]):
             with col:
                 for k in group:
                     st.subheader(k)
-                    for it in fetch_rss(RSS_SOURCES[k], limit=7):
+                    for it in feeds.get(RSS_SOURCES[k], []):
                         st.markdown(f"- **[{it['title']}]({it['link']})**")
                         if it["published"]: st.caption(it["published"])
                     st.markdown("---")
@@ -534,8 +880,22 @@ elif page == "📰 뉴스/코멘트":
         acct_label = st.selectbox("계정 선택", list(X_USERNAMES.keys()))
         handle = X_USERNAMES[acct_label]
         refresh_sec = st.slider("새로고침(초)", 15, 180, 60, step=15)
-        auto_refresh_html(refresh_sec, key=f"x_refresh_{handle}")
+        auto_refresh(refresh_sec, key=f"x_refresh_{handle}")
+        # X API 트윗 목록은 호출 한도가 빡빡하므로 명시적으로 켤 때만 (기본은 임베드만)
+        use_api = st.toggle("X API로 최신 트윗 목록도 가져오기", value=False, disabled=not X_BEARER,
+                            help="X_BEARER_TOKEN 필요. 새로고침 주기마다 X API를 호출합니다.")
+        if X_BEARER and use_api:
+            uid = x_get_user_id(handle)
+            tweets = x_poll_tweets(uid, refresh_sec) if uid else []
+            with st.expander(f"@{handle} 최신 트윗 (X API)", expanded=bool(tweets)):
+                for tw in reversed(tweets):
+                    st.markdown(_format_tweet_text(tw))
+                    if tw.get("created_at"): st.caption(tw["created_at"])
+                if not tweets:
+                    st.caption("가져온 트윗이 없습니다.")
+        # 내용이 같으면 iframe이 재사용되므로 새로고침 주기마다 바뀌는 표식을 넣어 타임라인을 다시 로드
         embed_html = f"""
+        <!-- refresh {int(time.time() // refresh_sec)} -->
         <a class="twitter-timeline" href="https://twitter.com/{handle}?ref_src=twsrc%5Etfw">
           Tweets by @{handle}
         </a>
@@ -549,9 +909,17 @@ elif page == "📺 유튜브":
 
     # 1) 채널 목록 편집
     st.subheader("채널 목록 편집")
-    df_channels = st.session_state.get("yt_channels_df") or pd.DataFrame(DEFAULT_YT_CHANNELS)
+    df_channels = st.session_state.get("yt_channels_df")
+    if df_channels is None:
+        df_channels = pd.DataFrame(DEFAULT_YT_CHANNELS)
     df_channels = st.data_editor(df_channels, num_rows="dynamic", key="yt_channels_editor")
     st.session_state["yt_channels_df"] = df_channels
+    channels = []
+    for _, row in df_channels.iterrows():
+        name = str(row.get("채널명","")).strip()
+        cid  = str(row.get("channel_id","")).strip()
+        if cid: channels.append((name, cid))
+    cids = [cid for _, cid in channels]
 
     st.markdown("---")
 
@@ -560,21 +928,18 @@ elif page == "📺 유튜브":
     refresh_live = st.checkbox("자동 새로고침(초) 설정", value=True)
     live_interval = st.slider("라이브 체크 주기(초)", 30, 180, 60, step=15, disabled=not refresh_live)
     if refresh_live:
-        auto_refresh_html(live_interval, key="yt_live_refresh")
+        auto_refresh(live_interval, key="yt_live_refresh")
 
     if df_channels.empty:
         st.info("채널을 추가하세요. 예: channel_id = UC_x5XG1OV2P6uZZ5FSM9TtQ")
     else:
         if not YOUTUBE_API_KEY:
             st.info("YOUTUBE_API_KEY가 없어서 라이브 상태는 API 없이 확인합니다. 각 채널의 `/live` 링크를 눌러 확인하세요.")
+        # API가 있으면 모든 채널의 라이브 여부를 한 번에 확인
+        lives_by_channel = yt_api_live_for_channels(tuple(cids)) if YOUTUBE_API_KEY else {}
+        all_lives = [lives_by_channel.get(cid, [])[:2] for cid in cids]
         live_cols = st.columns(3)
-        idx = 0
-        for _, row in df_channels.iterrows():
-            name = str(row.get("채널명","")).strip()
-            cid  = str(row.get("channel_id","")).strip()
-            if not cid: continue
-            # API가 있으면 라이브 검색
-            lives = yt_api_live_videos(cid, max_results=2) if YOUTUBE_API_KEY else []
+        for idx, ((name, cid), lives) in enumerate(zip(channels, all_lives)):
             with live_cols[idx % 3]:
                 if lives:
                     for lv in lives:
@@ -583,7 +948,6 @@ elif page == "📺 유튜브":
                 else:
                     st.markdown(f"**{name}** — 현재 라이브 감지 없음")
                     st.caption(f"[채널 라이브 페이지 바로가기](https://www.youtube.com/channel/{cid}/live)")
-            idx += 1
 
     st.markdown("---")
 
@@ -592,15 +956,12 @@ elif page == "📺 유튜브":
     per_channel = st.slider("채널별 표시 개수", 1, 8, 3)
     refresh_latest = st.checkbox("최신 영상 자동 새로고침", value=False)
     if refresh_latest:
-        auto_refresh_html(90, key="yt_latest_refresh")
+        auto_refresh(90, key="yt_latest_refresh")
 
     if not df_channels.empty:
-        for _, row in df_channels.iterrows():
-            name = str(row.get("채널명","")).strip()
-            cid  = str(row.get("channel_id","")).strip()
-            if not cid: continue
+        all_vids = yt_fetch_for_channels(yt_api_latest_videos, cids, max_results=per_channel)
+        for (name, cid), vids in zip(channels, all_vids):
             st.markdown(f"### {name}")
-            vids = yt_api_latest_videos(cid, max_results=per_channel)
             if not vids:
                 st.write("영상 정보를 가져오지 못했습니다.")
                 continue
@@ -625,20 +986,18 @@ elif page == "🏦 지분 변동(13F, 무료)":
         managers = {row["기관/펀드"]: str(row["CIK"]) for _, row in edited.iterrows()
                     if row.get("기관/펀드") and row.get("CIK")}
     if st.button("13F 새로 고침", type="primary"):
-        st.cache_data.clear()
+        clear_caches()
     with st.spinner("SEC에서 13F 불러오는 중..."):
         df = build_13f_table(managers)
     if df.empty:
         st.warning("데이터를 가져오지 못했습니다.")
     else:
-        fmt = df.copy()
-        if "보유주수(최근)" in fmt:
-            fmt["보유주수(최근)"] = fmt["보유주수(최근)"].map(lambda x: f"{x:,}" if pd.notna(x) else "")
-        if "평가액(USD, 최근)" in fmt:
-            fmt["평가액(USD, 최근)"] = fmt["평가액(USD, 최근)"].map(lambda x: f"${x:,}" if pd.notna(x) else "")
-        if "보유주수 증감(qoq)" in fmt:
-            fmt["보유주수 증감(qoq)"] = fmt["보유주수 증감(qoq)"].map(lambda x: f"{x:+,}" if pd.notna(x) else "")
-        st.dataframe(fmt, use_container_width=True)
+        # 숫자 열은 그대로 두고 표시 형식만 지정 (정렬도 숫자 기준 유지)
+        st.dataframe(df.style.format({
+            "보유주수(최근)": "{:,.0f}",
+            "평가액(USD, 최근)": "${:,.0f}",
+            "보유주수 증감(qoq)": "{:+,.0f}",
+        }, na_rep=""), use_container_width=True)
     st.info("참고: 13F는 분기 단위 공개이며, 일중 변동은 제공되지 않습니다.")
 
 # ---- 설정